@@ -0,0 +1 @@
+"""Synthetic data and benchmark tooling for svensk-flyt."""
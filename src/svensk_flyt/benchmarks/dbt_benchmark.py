@@ -0,0 +1,298 @@
+"""
+Benchmark harness for the dbt transformations.
+
+This script:
+1. Generates synthetic raw flight tables at the requested scale
+2. Runs `dbt build` against them in a scratch DuckDB file
+3. Records per-model runtime from dbt's run_results.json
+4. Re-runs each model's compiled SQL under `EXPLAIN ANALYZE` to capture peak
+   buffer memory and the profiled query plan
+5. Saves the results and flags regressions against a saved baseline
+
+Usage:
+    python -m svensk_flyt.benchmarks.dbt_benchmark --days 1826 --duplicates 2 \\
+        --baseline benchmarks/baselines/5y_10_airports.json
+"""
+
+import json
+import logging
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+
+import duckdb
+
+from svensk_flyt.benchmarks.synthetic import build_arg_parser, generate_from_args
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+DBT_PROJECT_DIR = Path(__file__).parents[3] / "dbt"
+BENCHMARK_DIR = Path(__file__).parents[3] / "benchmarks"
+
+# A metric only counts as a regression if it grows by more than this fraction...
+REGRESSION_TOLERANCE = 0.25
+# ...and by more than these absolute amounts, so tiny models don't flag on noise
+MIN_SECONDS_DELTA = 0.5
+MIN_MEMORY_DELTA_BYTES = 16 * 1024 * 1024
+
+PROFILE_TEMPLATE = """svensk_flyt:
+  outputs:
+    benchmark:
+      type: duckdb
+      path: {path}
+      schema: flights
+      threads: {threads}
+  target: benchmark
+"""
+
+# DuckDB profiling metrics recorded for every model
+PROFILING_SETTINGS = {
+    "LATENCY": "true",
+    "ROWS_RETURNED": "true",
+    "SYSTEM_PEAK_BUFFER_MEMORY": "true",
+    "OPERATOR_NAME": "true",
+    "OPERATOR_TYPE": "true",
+    "OPERATOR_TIMING": "true",
+    "OPERATOR_CARDINALITY": "true",
+}
+
+
+def write_profiles(work_dir: Path, duckdb_path: str, threads: int) -> Path:
+    """Write a dbt profiles.yml pointing at the benchmark database."""
+    work_dir.mkdir(parents=True, exist_ok=True)
+    profiles_path = work_dir / "profiles.yml"
+    profiles_path.write_text(
+        PROFILE_TEMPLATE.format(path=Path(duckdb_path).resolve().as_posix(), threads=threads),
+        encoding="utf-8",
+    )
+    return work_dir
+
+
+def _children_peak_rss_mb() -> float | None:
+    """Peak resident memory of finished child processes in MB (Linux reports KB)."""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+
+
+def run_dbt_build(profiles_dir: Path, target_path: Path) -> dict:
+    """Run `dbt build` as a subprocess and time it."""
+    base_args = [
+        "--project-dir", str(DBT_PROJECT_DIR),
+        "--profiles-dir", str(profiles_dir),
+    ]
+
+    if not (DBT_PROJECT_DIR / "dbt_packages").exists():
+        logger.info("Installing dbt packages...")
+        subprocess.run(["dbt", "deps", *base_args], check=True)
+
+    # A stale file from an earlier run must not pass for this build's results
+    (target_path / "run_results.json").unlink(missing_ok=True)
+
+    logger.info("Running dbt build...")
+    started = time.perf_counter()
+    completed = subprocess.run(
+        ["dbt", "build", *base_args, "--target-path", str(target_path)],
+        check=False,
+    )
+    elapsed = time.perf_counter() - started
+
+    if completed.returncode != 0:
+        logger.warning(f"dbt build exited with code {completed.returncode}")
+
+    return {
+        "returncode": completed.returncode,
+        "seconds": round(elapsed, 3),
+        # Includes `dbt deps` if it ran, which is far below a real build
+        "peak_rss_mb": _children_peak_rss_mb(),
+    }
+
+
+def load_run_results(target_path: Path) -> list[dict]:
+    """Read the model results from dbt's run_results.json."""
+    run_results = json.loads((target_path / "run_results.json").read_text(encoding="utf-8"))
+    return [
+        result for result in run_results["results"]
+        if result["unique_id"].startswith("model.")
+    ]
+
+
+def profile_model(con: duckdb.DuckDBPyConnection, compiled_code: str) -> dict:
+    """Run a model's compiled SQL under EXPLAIN ANALYZE and return the JSON profile."""
+    rows = con.execute(f"EXPLAIN ANALYZE {compiled_code}").fetchall()
+    # With JSON profiling the second column holds the profile tree
+    return json.loads(rows[0][1])
+
+
+def profile_models(duckdb_path: str, model_results: list[dict]) -> dict:
+    """
+    Collect timing, peak memory and query plan for every successfully built model.
+
+    Each model is profiled on its own connection: DuckDB's
+    `system_peak_buffer_memory` is a high-water mark for the whole connection,
+    so reusing one would report the hungriest earlier model for every later one.
+    """
+    models = {}
+
+    for result in model_results:
+        name = result["unique_id"].split(".")[-1]
+        model = {
+            "status": result["status"],
+            "execution_time": round(result["execution_time"], 3),
+        }
+
+        if result["status"] == "success" and result.get("compiled_code"):
+            con = duckdb.connect(duckdb_path, read_only=True)
+            try:
+                con.execute("PRAGMA enable_profiling = 'json'")
+                con.execute(f"PRAGMA custom_profiling_settings = '{json.dumps(PROFILING_SETTINGS)}'")
+                plan = profile_model(con, result["compiled_code"])
+                model["explain_latency"] = round(plan.get("latency", 0.0), 3)
+                model["peak_buffer_memory_bytes"] = plan.get("system_peak_buffer_memory")
+                model["plan"] = plan
+            except Exception as e:
+                logger.warning(f"Could not profile {name}: {e}")
+            finally:
+                con.close()
+
+        models[name] = model
+
+    return models
+
+
+def compare_to_baseline(results: dict, baseline: dict) -> list[str]:
+    """Return human-readable regressions of `results` relative to `baseline`."""
+    regressions = []
+
+    def check(label: str, current, previous, min_delta):
+        if current is None or previous is None:
+            return
+        if current - previous > min_delta and current > previous * (1 + REGRESSION_TOLERANCE):
+            regressions.append(f"{label}: {previous} -> {current}")
+
+    check("dbt build seconds", results.get("dbt_build", {}).get("seconds"),
+          baseline.get("dbt_build", {}).get("seconds"), MIN_SECONDS_DELTA)
+    check("dbt build peak RSS MB", results.get("dbt_build", {}).get("peak_rss_mb"),
+          baseline.get("dbt_build", {}).get("peak_rss_mb"), MIN_MEMORY_DELTA_BYTES / 1024 / 1024)
+
+    for name, model in results.get("models", {}).items():
+        previous = baseline.get("models", {}).get(name)
+        if previous is None:
+            continue
+        if previous.get("status") == "success" and model.get("status") != "success":
+            regressions.append(f"{name}: status {previous['status']} -> {model.get('status')}")
+        check(f"{name} execution_time", model.get("execution_time"),
+              previous.get("execution_time"), MIN_SECONDS_DELTA)
+        check(f"{name} peak_buffer_memory_bytes", model.get("peak_buffer_memory_bytes"),
+              previous.get("peak_buffer_memory_bytes"), MIN_MEMORY_DELTA_BYTES)
+
+    return regressions
+
+
+def save_results(results: dict, output_path: Path) -> None:
+    """Write summary JSON, with each model's plan split into its own file."""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    plans_dir = output_path.with_suffix("") / "plans"
+    plans_dir.mkdir(parents=True, exist_ok=True)
+
+    summary = json.loads(json.dumps(results))
+    for name, model in summary.get("models", {}).items():
+        plan = model.pop("plan", None)
+        if plan is not None:
+            (plans_dir / f"{name}.json").write_text(json.dumps(plan, indent=2), encoding="utf-8")
+
+    output_path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    logger.info(f"Results written to {output_path}")
+
+
+def main():
+    """Generate synthetic data, benchmark dbt build and compare with a baseline."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    parser = build_arg_parser()
+    parser.add_argument("--threads", type=int, default=4, help="dbt threads")
+    parser.add_argument("--skip-generate", action="store_true",
+                        help="Reuse synthetic data already in --duckdb-path")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="Results JSON (defaults to benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", type=Path, default=None,
+                        help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Write these results to --baseline instead of comparing")
+    args = parser.parse_args()
+    if args.save_baseline and not args.baseline:
+        parser.error("--save-baseline requires --baseline")
+
+    logger.info("=" * 80)
+    logger.info("Starting dbt benchmark")
+    logger.info("=" * 80)
+
+    results = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "scale": {
+            "days": args.days,
+            "airports": args.airports.split(","),
+            "duplicates_per_flight": args.duplicates,
+            "status_mix": args.status_mix,
+            "volume_scale": args.volume_scale,
+            "seed": args.seed,
+        },
+    }
+
+    if not args.skip_generate:
+        started = time.perf_counter()
+        results["synthetic"] = generate_from_args(args)
+        results["synthetic"]["seconds"] = round(time.perf_counter() - started, 3)
+
+    work_dir = BENCHMARK_DIR / "work"
+    profiles_dir = write_profiles(work_dir, args.duckdb_path, args.threads)
+    target_path = work_dir / "target"
+
+    results["dbt_build"] = run_dbt_build(profiles_dir, target_path)
+    if not (target_path / "run_results.json").exists():
+        returncode = results["dbt_build"]["returncode"]
+        logger.error(f"dbt build wrote no run_results.json (exit code {returncode})")
+        return returncode or 1
+    model_results = load_run_results(target_path)
+    results["models"] = profile_models(args.duckdb_path, model_results)
+
+    for name, model in sorted(results["models"].items(), key=lambda m: -m[1]["execution_time"]):
+        memory = model.get("peak_buffer_memory_bytes")
+        memory_mb = f"{memory / 1024 / 1024:.1f} MB" if memory is not None else "n/a"
+        logger.info(f"  - {name}: {model['execution_time']}s, peak {memory_mb} ({model['status']})")
+
+    output = args.output or BENCHMARK_DIR / "results" / f"{datetime.now():%Y%m%d_%H%M%S}.json"
+    save_results(results, output)
+
+    if args.baseline and args.save_baseline:
+        save_results(results, args.baseline)
+        return 0
+
+    if args.baseline:
+        if not args.baseline.exists():
+            logger.warning(f"Baseline {args.baseline} not found, run with --save-baseline first")
+            return 0
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline.get("scale") != results["scale"]:
+            logger.warning("Baseline was recorded at a different scale, comparison may be misleading")
+        regressions = compare_to_baseline(results, baseline)
+        if regressions:
+            logger.error(f"{len(regressions)} regression(s) against {args.baseline}:")
+            for regression in regressions:
+                logger.error(f"  - {regression}")
+            return 1
+        logger.info(f"No regressions against {args.baseline}")
+
+    return 0 if results["dbt_build"]["returncode"] == 0 else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,201 @@
+"""
+Benchmark for the typed FlightRecord layer.
+
+Measures, for synthetic API-shaped responses:
+1. Memory of the resource step as dlt runs it: a parsed page goes in, and the
+   arrow table handed to dlt comes out. Reports what the page itself holds,
+   what the output holds and the step's peak on top of the page.
+2. Validation throughput of one batch call per response vs one call per flight
+
+Usage:
+    python -m svensk_flyt.benchmarks.flight_records --flights 1000 --repeat 20
+"""
+
+import argparse
+import gc
+import json
+import logging
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+import pyarrow as pa
+from pydantic import TypeAdapter
+
+from svensk_flyt.benchmarks.synthetic import AIRLINES, DEFAULT_STATUS_MIX, PARTNER_AIRPORTS
+from svensk_flyt.defs.dlt.pipelines.flight_records import FlightRecord, flight_record_step, validate_flights
+
+logger = logging.getLogger(__name__)
+
+
+def _utc(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def make_api_flights(count: int, airport: str = "ARN", direction: str = "arrivals", seed: int = 42) -> list[dict]:
+    """Generate flights shaped like the `flights` array of an endpoint response."""
+    rng = random.Random(seed)
+    is_arrival = direction == "arrivals"
+    day = datetime(2026, 1, 25, tzinfo=timezone.utc)
+    statuses = list(DEFAULT_STATUS_MIX)
+    weights = list(DEFAULT_STATUS_MIX.values())
+    partners = [p for p in PARTNER_AIRPORTS if p[0] != airport]
+
+    flights = []
+    for _ in range(count):
+        iata, icao, name = rng.choice(AIRLINES)
+        partner_iata, partner_swedish, partner_english = rng.choice(partners)
+        number = f"{iata}{rng.randint(100, 8999)}"
+        status = rng.choices(statuses, weights)[0]
+        scheduled = day + timedelta(minutes=rng.randrange(300, 1440, 5))
+        actual = scheduled + timedelta(seconds=rng.randint(-900, 1800))
+
+        times = {"scheduledUtc": _utc(scheduled)}
+        if status == "LAN":
+            times["estimatedUtc"] = _utc(actual)
+            times["actualUtc"] = _utc(actual)
+
+        flight = {
+            "flightId": number,
+            "airlineOperator": {"iata": iata, "icao": icao, "name": name},
+            "flightLegIdentifier": {
+                "callsign": f"{icao}{number[len(iata):]}",
+                "flightId": number,
+                "flightDepartureDateUtc": _utc(day),
+                "departureAirportIata": partner_iata if is_arrival else airport,
+                "arrivalAirportIata": airport if is_arrival else partner_iata,
+                "aircraftRegistration": f"SE-R{rng.choice('ABCDEFGH')}{rng.choice('ABCDEFGH')}",
+            },
+            "locationAndStatus": {
+                "terminal": "5",
+                "gate": f"F{rng.randint(1, 40)}",
+                "flightLegStatus": status,
+                "flightLegStatusSwedish": status,
+                "flightLegStatusEnglish": status,
+            },
+            "diIndicator": rng.choice(["D", "I", "S"]),
+            "codeShareData": [],
+            "remarksEnglish": [],
+            "remarksSwedish": [],
+        }
+        if is_arrival:
+            flight["departureAirportSwedish"] = partner_swedish
+            flight["departureAirportEnglish"] = partner_english
+            flight["arrivalTime"] = times
+            if status == "LAN":
+                first_bag = actual + timedelta(minutes=rng.randint(8, 20))
+                flight["baggage"] = {
+                    "baggageClaimUnit": str(rng.randint(1, 8)),
+                    "firstBagUtc": _utc(first_bag),
+                    "lastBagUtc": _utc(first_bag + timedelta(minutes=rng.randint(5, 30))),
+                }
+        else:
+            flight["arrivalAirportSwedish"] = partner_swedish
+            flight["arrivalAirportEnglish"] = partner_english
+            flight["departureTime"] = times
+            flight["checkIn"] = {"checkInDeskFrom": rng.randint(1, 20), "checkInDeskTo": rng.randint(21, 40)}
+        flights.append(flight)
+
+    return flights
+
+
+def retained_bytes(build) -> int:
+    """Bytes still allocated by whatever `build()` returns once temporaries are freed."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return current
+
+
+def step_memory(page: list[dict], step) -> dict:
+    """
+    Memory of running a resource step on an already parsed page.
+
+    Arrow buffers are not seen by tracemalloc, so the output's arrow
+    allocations are added to both the retained and the peak figure.
+    """
+    gc.collect()
+    arrow_before = pa.total_allocated_bytes()
+    tracemalloc.start()
+    try:
+        output = step(page)
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    arrow_bytes = pa.total_allocated_bytes() - arrow_before
+    del output
+    return {"output_bytes": current + arrow_bytes, "peak_bytes": peak + arrow_bytes}
+
+
+def benchmark(flights: int, repeat: int, direction: str) -> dict:
+    """Run the memory and throughput measurements and return a summary."""
+    payload = json.dumps({"flights": make_api_flights(flights, direction=direction)})
+
+    page_bytes = retained_bytes(lambda: json.loads(payload)["flights"])
+    step = step_memory(json.loads(payload)["flights"], flight_record_step("ARN", direction, "2026-01-25"))
+
+    parsed = json.loads(payload)["flights"]
+    batch = TypeAdapter(list[FlightRecord])
+    single = TypeAdapter(FlightRecord)
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        batch.validate_python(parsed)
+    batch_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        [single.validate_python(flight) for flight in parsed]
+    per_flight_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        validate_flights(parsed).to_arrow()
+    step_seconds = time.perf_counter() - started
+
+    return {
+        "flights": flights,
+        "direction": direction,
+        "page_bytes_per_1k": round(page_bytes / flights * 1000),
+        "step_output_bytes_per_1k": round(step["output_bytes"] / flights * 1000),
+        "step_peak_bytes_per_1k": round(step["peak_bytes"] / flights * 1000),
+        "batch_flights_per_second": round(flights * repeat / batch_seconds),
+        "per_flight_flights_per_second": round(flights * repeat / per_flight_seconds),
+        "step_flights_per_second": round(flights * repeat / step_seconds),
+    }
+
+
+def main():
+    """Benchmark the flight record step's memory and validation throughput from the command line."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    parser = argparse.ArgumentParser(description="Benchmark the typed FlightRecord layer")
+    parser.add_argument("--flights", type=int, default=1000, help="Flights per simulated response")
+    parser.add_argument("--repeat", type=int, default=20, help="Validation rounds for throughput")
+    args = parser.parse_args()
+
+    for direction in ("arrivals", "departures"):
+        results = benchmark(args.flights, args.repeat, direction)
+        logger.info(f"{direction} ({results['flights']} flights):")
+        logger.info(f"  - Parsed page (step input):  {results['page_bytes_per_1k'] / 1024:.0f} KiB per 1k flights")
+        logger.info(f"  - Arrow table (step output): {results['step_output_bytes_per_1k'] / 1024:.0f} KiB per 1k flights")
+        logger.info(f"  - Step peak on top of page:  {results['step_peak_bytes_per_1k'] / 1024:.0f} KiB per 1k flights")
+        logger.info(f"  - Batch validation:      {results['batch_flights_per_second']:,} flights/s")
+        logger.info(f"  - Per-flight validation: {results['per_flight_flights_per_second']:,} flights/s")
+        logger.info(f"  - Full step (to arrow):  {results['step_flights_per_second']:,} flights/s")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,414 @@
+"""
+Synthetic flight-data generator for scale testing the dbt models.
+
+Writes `flights_arrivals_raw` and `flights_departures_raw` tables into a DuckDB
+file with the same flattened column names dlt produces from the Swedavia API,
+so `stg_*` -> `int_flights` -> `fct_flights` -> marts can be built against
+years of data instead of the few days the API gives us.
+
+All rows are generated inside DuckDB with hash-based pseudo randomness, which
+keeps generation fast at millions of rows and deterministic for a given seed.
+
+Usage:
+    python -m svensk_flyt.benchmarks.synthetic --days 1826 --duplicates 2
+"""
+
+import argparse
+import logging
+from datetime import date, timedelta
+from pathlib import Path
+
+import duckdb
+
+from svensk_flyt.constants import (
+    SWEDAVIA_AIRPORTS,
+    FLIGHT_LEG_STATUSES,
+    DUCKDB_DATASET_NAME,
+    TABLE_ARRIVALS_RAW,
+    TABLE_DEPARTURES_RAW,
+)
+
+logger = logging.getLogger(__name__)
+
+# Typical flights per day and direction, based on the raw data seen in January 2026
+FLIGHTS_PER_DAY = {
+    "ARN": 270,
+    "GOT": 90,
+    "BMA": 50,
+    "MMX": 40,
+    "LLA": 25,
+    "UME": 25,
+    "OSD": 12,
+    "VBY": 12,
+    "RNB": 6,
+    "KRN": 6,
+}
+
+# Status distribution observed in flights_arrivals_raw (see notebooks/01_eda_raw_data.ipynb)
+DEFAULT_STATUS_MIX = {
+    "LAN": 0.68,
+    "DEL": 0.21,
+    "SCH": 0.10,
+    "CAN": 0.01,
+}
+
+# (iata, icao, name) — most frequent operators in the raw data
+AIRLINES = [
+    ("SK", "SAS", "SAS Scandinavian Airlines"),
+    ("SK", "SAS", "SAS Scandinavian Airlines"),
+    ("SK", "SAS", "SAS Scandinavian Airlines"),
+    ("D8", "NSZ", "Norwegian"),
+    ("FR", "RYR", "Ryanair Ltd"),
+    ("LH", "DLH", "Lufthansa"),
+    ("AY", "FIN", "Finnair"),
+    ("KL", "KLM", "KLM"),
+    ("LX", "SWR", "Swiss"),
+    ("HP", "POP", "PopulAir"),
+    ("AF", "AFR", "Air France"),
+    ("BA", "BAW", "British Airways"),
+]
+
+# (iata, swedish name, english name) — counterpart airports for routes
+PARTNER_AIRPORTS = [
+    ("ARN", "Stockholm ARN", "Stockholm ARN"),
+    ("GOT", "Göteborg", "Göteborg"),
+    ("MMX", "Malmö", "Malmö"),
+    ("LLA", "Luleå", "Luleå"),
+    ("UME", "Umeå", "Umeå"),
+    ("VBY", "Visby", "Visby"),
+    ("CPH", "Köpenhamn", "Copenhagen"),
+    ("HEL", "Helsingfors", "Helsinki"),
+    ("OSL", "Oslo", "Oslo"),
+    ("AMS", "Amsterdam", "Amsterdam"),
+    ("LHR", "London LHR", "London LHR"),
+    ("CDG", "Paris CDG", "Paris CDG"),
+    ("FRA", "Frankfurt", "Frankfurt"),
+    ("ZRH", "Zürich", "Zürich"),
+]
+
+
+def _values_sql(rows: list[tuple]) -> str:
+    """Render a list of tuples as a SQL VALUES list."""
+    rendered = []
+    for row in rows:
+        cells = []
+        for value in row:
+            if isinstance(value, str):
+                cells.append("'" + value.replace("'", "''") + "'")
+            else:
+                cells.append(repr(value))
+        rendered.append(f"({', '.join(cells)})")
+    return ",\n            ".join(rendered)
+
+
+def _status_ranges(status_mix: dict) -> list[tuple]:
+    """Convert a status -> weight mapping into cumulative [lower, upper) ranges."""
+    unknown = set(status_mix) - set(FLIGHT_LEG_STATUSES)
+    if unknown:
+        raise ValueError(f"Unknown flight leg status codes: {', '.join(sorted(unknown))}")
+
+    total = sum(status_mix.values())
+    if total <= 0:
+        raise ValueError("Status mix weights must sum to a positive number")
+
+    ranges = []
+    lower = 0.0
+    for status, weight in status_mix.items():
+        upper = lower + weight / total
+        ranges.append((status, lower, upper))
+        lower = upper
+    # Guard against floating point drift so every row gets a status
+    status, lower, _ = ranges[-1]
+    ranges[-1] = (status, lower, 1.0)
+    return ranges
+
+
+def _flights_sql(direction: str, seed: int) -> str:
+    """
+    Build the SELECT generating one raw table.
+
+    Expects the temp tables `_synthetic_airports`, `_synthetic_days`,
+    `_synthetic_airlines`, `_synthetic_partners`, `_synthetic_statuses` and
+    `_synthetic_duplicates`.
+    """
+    is_arrival = direction == "arrivals"
+    time_prefix = "arrival_time" if is_arrival else "departure_time"
+    # Arrivals list the counterpart as the departure airport and vice versa
+    partner_prefix = "departure_airport" if is_arrival else "arrival_airport"
+    origin = "p.iata" if is_arrival else "f.airport"
+    destination = "f.airport" if is_arrival else "p.iata"
+
+    baggage_columns = ""
+    if is_arrival:
+        baggage_columns = """,
+        case when f.status = 'LAN' then cast(1 + (f.h >> 44) % 8 as varchar) end as baggage__baggage_claim_unit,
+        case when f.status = 'LAN' then cast(f.actual_ts + to_minutes(8 + cast((f.h >> 48) % 12 as bigint)) as timestamptz) end as baggage__first_bag_utc,
+        case when f.status = 'LAN' then cast(f.actual_ts + to_minutes(13 + cast((f.h >> 48) % 12 + (f.h >> 52) % 25 as bigint)) as timestamptz) end as baggage__last_bag_utc"""
+
+    return f"""
+    with base as (
+        select
+            a.airport,
+            d.day,
+            unnest(range(a.flights_per_day)) as seq
+        from _synthetic_airports a
+        cross join _synthetic_days d
+    ),
+
+    hashed as (
+        select
+            *,
+            hash({seed}, '{direction}', airport, day, seq) as h
+        from base
+    ),
+
+    shaped as (
+        select
+            h.airport,
+            h.day,
+            h.seq,
+            h.h,
+            s.status,
+            -- Scheduled between 05:00 and 23:55 UTC on five minute marks
+            cast(h.day as timestamp) + to_minutes(cast(300 + ((h.h >> 16) % 228) * 5 as bigint)) as scheduled_ts,
+            -- Mostly small deviations with a long tail of late flights
+            cast(h.day as timestamp) + to_minutes(cast(300 + ((h.h >> 16) % 228) * 5 as bigint))
+                + to_seconds(cast(
+                    cast((h.h >> 24) % 1800 as bigint) - 900
+                    + case when (h.h >> 36) % 10 = 0 then ((h.h >> 40) % 120) * 60 else 0 end
+                  as bigint)) as actual_ts
+        from hashed h
+        inner join _synthetic_statuses s
+            on ((h.h >> 4) % 100000) / 100000.0 >= s.lower_bound
+           and ((h.h >> 4) % 100000) / 100000.0 < s.upper_bound
+    ),
+
+    flights as (
+        select
+            f.*,
+            al.iata as airline_iata,
+            al.icao as airline_icao,
+            al.name as airline_name,
+            -- Never route an airport to itself
+            case when pp.iata = f.airport then 'CPH' else pp.iata end as partner_iata,
+            al.iata || cast(100 + (f.h >> 12) % 8900 as varchar) as flight_number
+        from shaped f
+        inner join _synthetic_airlines al
+            on al.idx = (f.h >> 8) % {len(AIRLINES)}
+        inner join _synthetic_partners pp
+            on pp.idx = (f.h >> 20) % {len(PARTNER_AIRPORTS)}
+    )
+
+    select
+        f.flight_number as flight_id,
+        p.swedish as {partner_prefix}_swedish,
+        p.english as {partner_prefix}_english,
+        f.airline_iata as airline_operator__iata,
+        f.airline_icao as airline_operator__icao,
+        f.airline_name as airline_operator__name,
+        cast(f.scheduled_ts as timestamptz) as {time_prefix}__scheduled_utc,
+        cast(case when f.status in ('LAN', 'SCH') then f.actual_ts end as timestamptz) as {time_prefix}__estimated_utc,
+        cast(case when f.status = 'LAN' then f.actual_ts end as timestamptz) as {time_prefix}__actual_utc,
+        cast(case when f.airport = 'ARN' then 2 + (f.h >> 56) % 4 else 1 end as bigint) as location_and_status__terminal,
+        case when f.status = 'LAN' then chr(65 + cast((f.h >> 58) % 6 as integer)) || cast(1 + (f.h >> 32) % 40 as varchar) end as location_and_status__gate,
+        f.status as location_and_status__flight_leg_status,
+        f.airline_icao || cast(100 + (f.h >> 12) % 8900 as varchar) as flight_leg_identifier__callsign,
+        f.flight_number as flight_leg_identifier__flight_id,
+        cast(f.day as timestamptz) as flight_leg_identifier__flight_departure_date_utc,
+        {origin} as flight_leg_identifier__departure_airport_iata,
+        {destination} as flight_leg_identifier__arrival_airport_iata{baggage_columns},
+        -- One row per load that saw this flight; later loads re-fetch the same flight
+        cast(epoch(cast(f.day as timestamp) + to_days(dup.n) + to_hours(19)) as bigint)::varchar || '.000000' as _dlt_load_id,
+        substr(md5(concat_ws('|', '{direction}', f.airport, f.day, f.seq, dup.n)), 1, 14) as _dlt_id
+    from flights f
+    inner join _synthetic_partners p on p.iata = f.partner_iata
+    cross join _synthetic_duplicates dup
+    """
+
+
+def generate_synthetic_flights(
+    duckdb_path: str,
+    days: int = 30,
+    airports: list[str] | None = None,
+    duplicates_per_flight: int = 1,
+    status_mix: dict | None = None,
+    end_date: date | None = None,
+    volume_scale: float = 1.0,
+    seed: int = 42,
+) -> dict:
+    """
+    Generate synthetic raw flight tables in a DuckDB file.
+
+    Existing `flights_arrivals_raw` / `flights_departures_raw` tables in the
+    target schema are replaced, so always point this at a scratch database.
+
+    Args:
+        duckdb_path: DuckDB file to write to
+        days: Number of days of data, ending at `end_date`
+        airports: Swedavia airport IATA codes (defaults to all 10)
+        duplicates_per_flight: How many loads re-fetched each flight (>= 1)
+        status_mix: Flight leg status -> relative weight (defaults to observed mix)
+        end_date: Last generated date (defaults to yesterday)
+        volume_scale: Multiplier on the typical flights per day for each airport
+        seed: Seed for the deterministic pseudo random values
+
+    Returns:
+        Summary dict with row counts per table and the generated date range
+    """
+    airports = [a.strip().upper() for a in (airports or SWEDAVIA_AIRPORTS)]
+    unknown = [a for a in airports if a not in FLIGHTS_PER_DAY]
+    if unknown:
+        raise ValueError(f"Unknown Swedavia airports: {', '.join(unknown)}")
+    if days < 1:
+        raise ValueError("days must be at least 1")
+    if duplicates_per_flight < 1:
+        raise ValueError("duplicates_per_flight must be at least 1")
+
+    status_ranges = _status_ranges(status_mix or DEFAULT_STATUS_MIX)
+    end_date = end_date or (date.today() - timedelta(days=1))
+    start_date = end_date - timedelta(days=days - 1)
+
+    Path(duckdb_path).parent.mkdir(parents=True, exist_ok=True)
+    logger.info(
+        f"Generating {days} days ({start_date} to {end_date}) for {len(airports)} airports "
+        f"with {duplicates_per_flight} load(s) per flight into {duckdb_path}"
+    )
+
+    airport_rows = [(a, max(1, round(FLIGHTS_PER_DAY[a] * volume_scale))) for a in airports]
+    airline_rows = [(i, *airline) for i, airline in enumerate(AIRLINES)]
+    partner_rows = [(i, *partner) for i, partner in enumerate(PARTNER_AIRPORTS)]
+
+    con = duckdb.connect(duckdb_path)
+    try:
+        # Timestamps are generated as UTC wall clock times
+        con.execute("SET TimeZone = 'UTC'")
+        con.execute(f"CREATE SCHEMA IF NOT EXISTS {DUCKDB_DATASET_NAME}")
+
+        con.execute(f"""
+            CREATE OR REPLACE TEMP TABLE _synthetic_airports AS
+            SELECT * FROM (VALUES
+            {_values_sql(airport_rows)}
+            ) AS t(airport, flights_per_day)
+        """)
+        con.execute(f"""
+            CREATE OR REPLACE TEMP TABLE _synthetic_days AS
+            SELECT cast(range AS date) AS day
+            FROM range(DATE '{start_date}', DATE '{end_date}' + INTERVAL 1 DAY, INTERVAL 1 DAY)
+        """)
+        con.execute(f"""
+            CREATE OR REPLACE TEMP TABLE _synthetic_airlines AS
+            SELECT * FROM (VALUES
+            {_values_sql(airline_rows)}
+            ) AS t(idx, iata, icao, name)
+        """)
+        con.execute(f"""
+            CREATE OR REPLACE TEMP TABLE _synthetic_partners AS
+            SELECT * FROM (VALUES
+            {_values_sql(partner_rows)}
+            ) AS t(idx, iata, swedish, english)
+        """)
+        con.execute(f"""
+            CREATE OR REPLACE TEMP TABLE _synthetic_statuses AS
+            SELECT * FROM (VALUES
+            {_values_sql(status_ranges)}
+            ) AS t(status, lower_bound, upper_bound)
+        """)
+        con.execute(f"""
+            CREATE OR REPLACE TEMP TABLE _synthetic_duplicates AS
+            SELECT range AS n FROM range({duplicates_per_flight})
+        """)
+
+        results = {
+            "start_date": str(start_date),
+            "end_date": str(end_date),
+            "airports": airports,
+            "duplicates_per_flight": duplicates_per_flight,
+        }
+        for direction, table in (("arrivals", TABLE_ARRIVALS_RAW), ("departures", TABLE_DEPARTURES_RAW)):
+            con.execute(
+                f"CREATE OR REPLACE TABLE {DUCKDB_DATASET_NAME}.{table} AS {_flights_sql(direction, seed)}"
+            )
+            rows = con.execute(f"SELECT COUNT(*) FROM {DUCKDB_DATASET_NAME}.{table}").fetchone()[0]
+            results[f"{direction}_rows"] = rows
+            logger.info(f"  - {table}: {rows} rows")
+
+        # Mirror dlt's load bookkeeping so load-id based tooling works against synthetic data
+        con.execute(f"""
+            CREATE OR REPLACE TABLE {DUCKDB_DATASET_NAME}._dlt_loads AS
+            SELECT
+                _dlt_load_id AS load_id,
+                'swedavia_flights' AS schema_name,
+                0 AS status,
+                to_timestamp(cast(split_part(_dlt_load_id, '.', 1) AS bigint)) AS inserted_at,
+                'synthetic' AS schema_version_hash
+            FROM (
+                SELECT _dlt_load_id FROM {DUCKDB_DATASET_NAME}.{TABLE_ARRIVALS_RAW}
+                UNION
+                SELECT _dlt_load_id FROM {DUCKDB_DATASET_NAME}.{TABLE_DEPARTURES_RAW}
+            )
+            ORDER BY load_id
+        """)
+    finally:
+        con.close()
+
+    return results
+
+
+def parse_status_mix(value: str) -> dict:
+    """Parse a status mix like 'LAN=0.7,DEL=0.2,SCH=0.1' into a dict."""
+    mix = {}
+    for part in value.split(","):
+        status, _, weight = part.partition("=")
+        if not weight:
+            raise argparse.ArgumentTypeError(f"Expected STATUS=WEIGHT, got '{part}'")
+        mix[status.strip().upper()] = float(weight)
+    return mix
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Arguments shared by the generator and the benchmark harness."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--duckdb-path", default="data_warehouse/synthetic.duckdb",
+                        help="Scratch DuckDB file to write synthetic data to")
+    parser.add_argument("--days", type=int, default=30, help="Number of days to generate")
+    parser.add_argument("--airports", default=",".join(SWEDAVIA_AIRPORTS),
+                        help="Comma separated airport IATA codes")
+    parser.add_argument("--duplicates", type=int, default=1,
+                        help="Number of loads that re-fetched each flight")
+    parser.add_argument("--status-mix", type=parse_status_mix, default=None,
+                        help="Status weights, e.g. LAN=0.7,DEL=0.2,SCH=0.1")
+    parser.add_argument("--end-date", type=date.fromisoformat, default=None,
+                        help="Last generated date (YYYY-MM-DD), defaults to yesterday")
+    parser.add_argument("--volume-scale", type=float, default=1.0,
+                        help="Multiplier on typical flights per airport and day")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser
+
+
+def generate_from_args(args: argparse.Namespace) -> dict:
+    """Run the generator with parsed command line arguments."""
+    return generate_synthetic_flights(
+        duckdb_path=args.duckdb_path,
+        days=args.days,
+        airports=args.airports.split(","),
+        duplicates_per_flight=args.duplicates,
+        status_mix=args.status_mix,
+        end_date=args.end_date,
+        volume_scale=args.volume_scale,
+        seed=args.seed,
+    )
+
+
+def main():
+    """Generate synthetic raw tables from the command line."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    args = build_arg_parser().parse_args()
+    generate_from_args(args)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
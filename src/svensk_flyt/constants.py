@@ -21,10 +21,30 @@ SWEDAVIA_AIRPORTS = [
 SWEDAVIA_API_BASE_URL = "https://api.swedavia.se/flightinfo/v2"
 SWEDAVIA_API_DATE_FORMAT = "%Y-%m-%d"  # YYYY-MM-DD (UTC)
 
+# Flight leg status codes documented by Swedavia
+FLIGHT_LEG_STATUSES = (
+    "SCH",  # Scheduled
+    "FPL",  # Flight Plan
+    "FLS",  # Flight Suspended
+    "SEQ",  # Sequenced
+    "ACT",  # Active
+    "CAN",  # Cancelled
+    "LAN",  # Landed
+    "RER",  # Rerouted
+    "DIV",  # Diverted
+    "DEL",  # Deleted
+)
+
 # DLT configuration
 DUCKDB_FILE_PATH = "data_warehouse/svenska-flyt.duckdb"
 DUCKDB_DATASET_NAME = "flights"
 
+# How many days back (including today) the API serves flights for
+SWEDAVIA_API_HISTORY_DAYS = 3
+
+# Endpoint directions per airport: /{airport}/{direction}/{date}
+DIRECTIONS = ("arrivals", "departures")
+
 # Rate limiting
 API_CALL_DELAY_SECONDS = 2.0  # Delay between API calls (avoid 429 errors)
 API_RETRY_ATTEMPTS = 3
@@ -33,3 +53,10 @@ API_RETRY_DELAY_SECONDS = 2.0
 # Raw table names
 TABLE_ARRIVALS_RAW = "flights_arrivals_raw"
 TABLE_DEPARTURES_RAW = "flights_departures_raw"
+
+# Flights returned per (airport, direction, date), maintained by swedavia_source
+TABLE_COVERAGE_MANIFEST = "coverage_manifest"
+
+# Post-load validation and gap detection, both against the coverage manifest
+VALIDATION_BASELINE_DAYS = 14  # Rolling window of previous days per airport and direction
+VALIDATION_SHORT_RATIO = 0.5  # Flag endpoints returning less than half their baseline
@@ -0,0 +1,425 @@
+"""
+Typed flight records for Swedavia API responses.
+
+Each endpoint response is validated in one pydantic call into flat
+`FlightRecord` objects (a slotted dataclass) instead of being kept as nested
+dicts. Timestamps are parsed and status codes checked at ingestion, so bad
+values are reported per endpoint rather than surfacing later in SQL.
+
+The records are then packed into a columnar `pyarrow.Table`, which is what dlt
+receives. Each direction gets the columns, names and types dlt produced from
+the nested JSON before (`airline_operator__iata`, ...), so the raw tables keep
+their schema, and every page of a direction has the same arrow schema.
+
+Nothing the API returned is dropped:
+- A field that fails validation is set to null, and the error, including the
+  original value, is stored in the flight's `validation_errors` column
+- Keys the model does not know (or that belong to the other direction) are
+  kept as JSON in the `extra_fields` column
+"""
+
+import json
+import logging
+import re
+import sys
+from datetime import datetime
+from typing import Annotated, Any, Literal, get_args
+
+import pyarrow as pa
+from pydantic import AliasPath, ConfigDict, Field, TypeAdapter, ValidationError
+from pydantic.dataclasses import dataclass
+
+from svensk_flyt.constants import FLIGHT_LEG_STATUSES
+
+logger = logging.getLogger(__name__)
+
+FlightLegStatus = Literal[FLIGHT_LEG_STATUSES]
+
+
+def _path(*keys: str):
+    """Optional field read from a nested key path of the API response."""
+    return Field(default=None, validation_alias=AliasPath(*keys) if len(keys) > 1 else keys[0])
+
+
+# Codes such as terminal or gate come back as numbers or strings, kept as returned until
+# FlightBatch.to_arrow matches them to the raw column's type
+Code = int | str | None
+
+
+@dataclass(slots=True, config=ConfigDict(coerce_numbers_to_str=True))
+class FlightRecord:
+    """One arrival or departure as returned by `/{airport}/{direction}/{date}`."""
+
+    flight_id: Annotated[str | None, _path("flightId")]
+
+    # Airline
+    airline_iata: Annotated[str | None, _path("airlineOperator", "iata")]
+    airline_icao: Annotated[str | None, _path("airlineOperator", "icao")]
+    airline_name: Annotated[str | None, _path("airlineOperator", "name")]
+
+    # Flight leg
+    flight_number: Annotated[str | None, _path("flightLegIdentifier", "flightId")]
+    callsign: Annotated[str | None, _path("flightLegIdentifier", "callsign")]
+    flight_departure_date_utc: Annotated[datetime | None, _path("flightLegIdentifier", "flightDepartureDateUtc")]
+    departure_airport_iata: Annotated[str | None, _path("flightLegIdentifier", "departureAirportIata")]
+    arrival_airport_iata: Annotated[str | None, _path("flightLegIdentifier", "arrivalAirportIata")]
+    departure_airport_icao: Annotated[str | None, _path("flightLegIdentifier", "departureAirportIcao")]
+    arrival_airport_icao: Annotated[str | None, _path("flightLegIdentifier", "arrivalAirportIcao")]
+    aircraft_registration: Annotated[str | None, _path("flightLegIdentifier", "aircraftRegistration")]
+    ssr_code: Annotated[Code, _path("flightLegIdentifier", "ssrCode")]
+    di_indicator: Annotated[str | None, _path("diIndicator")]
+
+    # Location and status
+    flight_leg_status: Annotated[FlightLegStatus | None, _path("locationAndStatus", "flightLegStatus")]
+    flight_leg_status_swedish: Annotated[str | None, _path("locationAndStatus", "flightLegStatusSwedish")]
+    flight_leg_status_english: Annotated[str | None, _path("locationAndStatus", "flightLegStatusEnglish")]
+    terminal: Annotated[Code, _path("locationAndStatus", "terminal")]
+    gate: Annotated[Code, _path("locationAndStatus", "gate")]
+    gate_action: Annotated[str | None, _path("locationAndStatus", "gateAction")]
+    gate_action_swedish: Annotated[str | None, _path("locationAndStatus", "gateActionSwedish")]
+    gate_action_english: Annotated[str | None, _path("locationAndStatus", "gateActionEnglish")]
+    gate_open_utc: Annotated[datetime | None, _path("locationAndStatus", "gateOpenUtc")]
+    gate_close_utc: Annotated[datetime | None, _path("locationAndStatus", "gateCloseUtc")]
+
+    # Arrivals: counterpart airport, times and baggage
+    departure_airport_swedish: Annotated[str | None, _path("departureAirportSwedish")]
+    departure_airport_english: Annotated[str | None, _path("departureAirportEnglish")]
+    arrival_scheduled_utc: Annotated[datetime | None, _path("arrivalTime", "scheduledUtc")]
+    arrival_estimated_utc: Annotated[datetime | None, _path("arrivalTime", "estimatedUtc")]
+    arrival_actual_utc: Annotated[datetime | None, _path("arrivalTime", "actualUtc")]
+    baggage_claim_unit: Annotated[Code, _path("baggage", "baggageClaimUnit")]
+    first_bag_utc: Annotated[datetime | None, _path("baggage", "firstBagUtc")]
+    last_bag_utc: Annotated[datetime | None, _path("baggage", "lastBagUtc")]
+    estimated_first_bag_utc: Annotated[datetime | None, _path("baggage", "estimatedFirstBagUtc")]
+
+    # Departures: counterpart airport, times and check-in
+    arrival_airport_swedish: Annotated[str | None, _path("arrivalAirportSwedish")]
+    arrival_airport_english: Annotated[str | None, _path("arrivalAirportEnglish")]
+    departure_scheduled_utc: Annotated[datetime | None, _path("departureTime", "scheduledUtc")]
+    departure_estimated_utc: Annotated[datetime | None, _path("departureTime", "estimatedUtc")]
+    departure_actual_utc: Annotated[datetime | None, _path("departureTime", "actualUtc")]
+    check_in_desk_from: Annotated[Code, _path("checkIn", "checkInDeskFrom")]
+    check_in_desk_to: Annotated[Code, _path("checkIn", "checkInDeskTo")]
+    check_in_status: Annotated[str | None, _path("checkIn", "checkInStatus")]
+    check_in_status_swedish: Annotated[str | None, _path("checkIn", "checkInStatusSwedish")]
+    check_in_status_english: Annotated[str | None, _path("checkIn", "checkInStatusEnglish")]
+
+    # Lists of objects
+    code_share_data: Annotated[list[Any] | None, _path("codeShareData")]
+    remarks_english: Annotated[list[Any] | None, _path("remarksEnglish")]
+    remarks_swedish: Annotated[list[Any] | None, _path("remarksSwedish")]
+    via_destinations: Annotated[list[Any] | None, _path("viaDestinations")]
+
+    def __post_init__(self):
+        # Share one string object per distinct value across all records
+        for name in INTERNED_FIELDS:
+            value = getattr(self, name)
+            if type(value) is str:
+                setattr(self, name, sys.intern(value))
+
+
+# Low-cardinality fields repeated across most flights of a response
+INTERNED_FIELDS = (
+    "airline_iata",
+    "airline_icao",
+    "airline_name",
+    "departure_airport_iata",
+    "arrival_airport_iata",
+    "departure_airport_icao",
+    "arrival_airport_icao",
+    "flight_leg_status",
+    "flight_leg_status_swedish",
+    "flight_leg_status_english",
+    "departure_airport_swedish",
+    "departure_airport_english",
+    "arrival_airport_swedish",
+    "arrival_airport_english",
+    "gate_action",
+    "gate_action_swedish",
+    "gate_action_english",
+    "check_in_status",
+    "check_in_status_swedish",
+    "check_in_status_english",
+)
+
+# Column holding each flight's validation errors as JSON text (null when clean)
+VALIDATION_ERRORS_COLUMN = "validation_errors"
+
+# Column holding API keys FlightRecord does not load for a direction, as JSON text
+EXTRA_FIELDS_COLUMN = "extra_fields"
+
+# List fields, stored as JSON text since their items have no fixed shape
+JSON_FIELDS = ("code_share_data", "remarks_english", "remarks_swedish", "via_destinations")
+
+# Fields whose raw column type dlt inferred from the values the API returned. A raw
+# table that already has the column keeps its type; these are the types for a new one.
+CODE_FIELD_TYPES = {
+    "ssr_code": "text",
+    "terminal": "bigint",
+    "gate": "text",
+    "baggage_claim_unit": "text",
+    "check_in_desk_from": "bigint",
+    "check_in_desk_to": "bigint",
+}
+
+# Fields only the arrivals or only the departures endpoint returns; the other raw table has no such columns
+ARRIVAL_FIELDS = (
+    "departure_airport_swedish",
+    "departure_airport_english",
+    "arrival_scheduled_utc",
+    "arrival_estimated_utc",
+    "arrival_actual_utc",
+    "baggage_claim_unit",
+    "first_bag_utc",
+    "last_bag_utc",
+    "estimated_first_bag_utc",
+)
+DEPARTURE_FIELDS = (
+    "gate_action",
+    "gate_action_swedish",
+    "gate_action_english",
+    "gate_open_utc",
+    "gate_close_utc",
+    "arrival_airport_swedish",
+    "arrival_airport_english",
+    "departure_scheduled_utc",
+    "departure_estimated_utc",
+    "departure_actual_utc",
+    "check_in_desk_from",
+    "check_in_desk_to",
+    "check_in_status",
+    "check_in_status_swedish",
+    "check_in_status_english",
+)
+
+
+def column_name(path: tuple) -> str:
+    """Raw table column for an API key path, as dlt names it: camelCase -> snake_case, joined by '__'."""
+    return "__".join(re.sub(r"(?<=[a-z0-9])([A-Z])", r"_\1", key).lower() for key in path)
+
+
+def _arrow_type(name: str, annotation) -> pa.DataType:
+    """Arrow type for a FlightRecord field; code fields are resolved per table in to_arrow."""
+    types = set(get_args(annotation)) or {annotation}
+    if name in JSON_FIELDS or name in CODE_FIELD_TYPES:
+        return pa.string()
+    if datetime in types:
+        return pa.timestamp("us", tz="UTC")
+    return pa.string()
+
+
+def _key_path(field) -> tuple:
+    alias = field.validation_alias
+    return tuple(alias.path) if isinstance(alias, AliasPath) else (alias,)
+
+
+# (attribute, API key path, raw column, arrow type) for every field
+FIELD_COLUMNS = tuple(
+    (name, _key_path(field), column_name(_key_path(field)), _arrow_type(name, field.annotation))
+    for name, field in FlightRecord.__pydantic_fields__.items()
+)
+
+
+def _known_keys(field_columns: tuple) -> dict:
+    """API keys read by `field_columns`, as a nested dict; used to find keys they do not cover."""
+    known = {}
+    for _, key_path, _, _ in field_columns:
+        level = known
+        for key in key_path[:-1]:
+            level = level.setdefault(key, {})
+        level[key_path[-1]] = None
+    return known
+
+
+# Columns written to each direction's raw table (None: both, for ad hoc use)
+DIRECTION_COLUMNS = {
+    None: FIELD_COLUMNS,
+    "arrivals": tuple(c for c in FIELD_COLUMNS if c[0] not in DEPARTURE_FIELDS),
+    "departures": tuple(c for c in FIELD_COLUMNS if c[0] not in ARRIVAL_FIELDS),
+}
+DIRECTION_KNOWN_KEYS = {direction: _known_keys(columns) for direction, columns in DIRECTION_COLUMNS.items()}
+
+_FLIGHT_RECORDS = TypeAdapter(list[FlightRecord])
+
+
+def _without(value: Any, path: tuple) -> Any:
+    """Copy of `value` with the key at `path` removed, so it validates as null."""
+    if not path or not isinstance(value, dict):
+        return {}
+    key = path[0]
+    if key not in value:
+        return value
+    copy = dict(value)
+    if len(path) > 1 and isinstance(value[key], dict) and path[1] in value[key]:
+        copy[key] = _without(value[key], path[1:])
+    else:
+        del copy[key]
+    return copy
+
+
+def _extra_keys(value: dict, known: dict) -> dict:
+    """The part of `value` whose keys are not in `known`, keeping its nesting."""
+    extras = {}
+    for key, item in value.items():
+        if key not in known:
+            extras[key] = item
+        elif isinstance(known[key], dict) and isinstance(item, dict):
+            nested = _extra_keys(item, known[key])
+            if nested:
+                extras[key] = nested
+    return extras
+
+
+def _to_json(value: Any) -> str | None:
+    return None if value is None else json.dumps(value, ensure_ascii=False, default=str)
+
+
+class FlightBatch:
+    """Validated flights from a single endpoint response."""
+
+    __slots__ = ("airport", "direction", "date", "records", "errors", "extras")
+
+    def __init__(self, airport: str, direction: str, date: str, records: list, errors: dict, extras: dict):
+        self.airport = airport
+        self.direction = direction
+        self.date = date
+        self.records = records
+        # Flight index -> errors for the fields nulled in that flight
+        self.errors = errors
+        # Flight index -> API keys not loaded into columns, nested as returned
+        self.extras = extras
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    @property
+    def invalid(self) -> int:
+        """Number of flights with at least one field nulled by validation."""
+        return len(self.errors)
+
+    def _code_column(self, path: tuple, column: str, values: list, column_type: str) -> pa.Array:
+        """
+        Arrow column for a code field with the given dlt type, bigint or text.
+
+        Values that don't fit a bigint column are nulled and recorded as
+        validation errors.
+        """
+        if column_type != "bigint":
+            return pa.array([None if value is None else str(value) for value in values], type=pa.string())
+
+        integers = []
+        for i, value in enumerate(values):
+            if isinstance(value, str) and re.fullmatch(r"-?\d+", value.strip()):
+                value = int(value)
+            elif value is not None and type(value) is not int:
+                self.errors.setdefault(i, []).append({
+                    "field": ".".join(path),
+                    "message": f"Input should be an integer, {column} is a bigint column",
+                    "input": value,
+                })
+                value = None
+            integers.append(value)
+        return pa.array(integers, type=pa.int64())
+
+    def to_arrow(self, column_types: dict | None = None) -> pa.Table:
+        """
+        Columnar table for dlt, with the raw table's column names.
+
+        `column_types` maps existing raw columns to their dlt data types, so code
+        fields keep the type dlt gave them; every page of a table gets the same
+        arrow schema either way. Code values that don't fit are added to
+        `errors` before the `validation_errors` column is built.
+        """
+        column_types = column_types or {}
+        records = self.records
+        columns = {}
+
+        for name, path, column, arrow_type in DIRECTION_COLUMNS[self.direction]:
+            values = [getattr(record, name) for record in records]
+            if name in CODE_FIELD_TYPES:
+                column_type = column_types.get(column) or CODE_FIELD_TYPES[name]
+                columns[column] = self._code_column(path, column, values, column_type)
+                continue
+            if name in JSON_FIELDS:
+                values = [_to_json(value) for value in values]
+            columns[column] = pa.array(values, type=arrow_type)
+
+        columns[EXTRA_FIELDS_COLUMN] = pa.array(
+            [_to_json(self.extras.get(i)) for i in range(len(records))], type=pa.string()
+        )
+        columns[VALIDATION_ERRORS_COLUMN] = pa.array(
+            [_to_json(self.errors.get(i)) for i in range(len(records))], type=pa.string()
+        )
+        return pa.table(columns)
+
+
+def validate_flights(
+    flights: list[dict],
+    airport: str | None = None,
+    direction: str | None = None,
+    date: str | None = None,
+) -> FlightBatch:
+    """
+    Validate one endpoint response worth of flights in a single pass.
+
+    Fields that fail validation (unparseable timestamps, unknown status codes,
+    ...) are nulled and their errors kept on the returned batch; every flight
+    is kept.
+    """
+    if isinstance(flights, dict):
+        flights = [flights]
+
+    errors = {}
+    try:
+        records = _FLIGHT_RECORDS.validate_python(flights)
+    except ValidationError as e:
+        # Errors are located by list index and API key path, so the bad fields can be
+        # removed and the page validated once more
+        flights = list(flights)
+        for error in e.errors(include_url=False, include_context=False):
+            index, path = error["loc"][0], error["loc"][1:]
+            errors.setdefault(index, []).append({
+                "field": ".".join(str(key) for key in path),
+                "message": error["msg"],
+                "input": error["input"],
+            })
+            flights[index] = _without(flights[index], path)
+        records = _FLIGHT_RECORDS.validate_python(flights)
+
+    known = DIRECTION_KNOWN_KEYS[direction]
+    extras = {}
+    for index, flight in enumerate(flights):
+        if isinstance(flight, dict):
+            found = _extra_keys(flight, known)
+            if found:
+                extras[index] = found
+
+    return FlightBatch(airport, direction, date, records, errors, extras)
+
+
+def flight_record_step(airport: str, direction: str, date: str, column_types=None):
+    """
+    Build a resource step validating each endpoint response as one batch.
+
+    The step receives a whole page of flights, parses it into typed
+    FlightRecords and hands dlt a columnar arrow table built from them, so
+    the page's nested dicts can be freed before dlt normalizes anything.
+
+    `column_types`, if given, is called per page and returns the raw table's
+    existing column types (see `FlightBatch.to_arrow`).
+    """
+    def validate_page(flights):
+        batch = validate_flights(flights, airport=airport, direction=direction, date=date)
+        table = batch.to_arrow(column_types() if column_types else None)
+        if batch.errors:
+            index, errors = next(iter(batch.errors.items()))
+            logger.warning(
+                f"{airport} {direction} {date}: nulled invalid fields in {batch.invalid} flight(s), "
+                f"first at flight {index}, {errors[0]['field']}: {errors[0]['message']}"
+            )
+        return table
+
+    return validate_page
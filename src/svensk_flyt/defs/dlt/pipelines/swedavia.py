@@ -3,11 +3,77 @@ import dlt
 from dlt.sources.rest_api import RESTAPIConfig, rest_api_resources
 from dlt.common.typing import TSecretStrValue
 import logging
-from typing import List
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from svensk_flyt.constants import (
+    DIRECTIONS,
+    TABLE_ARRIVALS_RAW,
+    TABLE_DEPARTURES_RAW,
+    TABLE_COVERAGE_MANIFEST,
+)
+from .flight_records import VALIDATION_ERRORS_COLUMN, flight_record_step
 
 logger = logging.getLogger(__name__)
 
 
+def raw_column_types(table_name: str):
+    """
+    Build a callable returning the dlt data type of each column the raw table has so far.
+    
+    Read from the schema of the source being extracted, which includes columns
+    from earlier loads and earlier pages of this one. Empty outside a pipeline run.
+    """
+    def column_types() -> dict:
+        try:
+            schema = dlt.current.source_schema()
+        except Exception:
+            return {}
+        columns = schema.tables.get(table_name, {}).get("columns", {})
+        return {name: column.get("data_type") for name, column in columns.items()}
+    
+    return column_types
+
+
+def coverage_transformer(resource, airport: str, direction: str, date: str):
+    """
+    Build a transformer counting the flights an endpoint returned.
+    
+    It receives the same validated arrow tables as the raw table and merges one
+    row per (airport, direction, flight_date) into the coverage manifest, with
+    the flights returned and how many of them had no validation errors. Counts
+    are cumulative across pages, and dedup keeps the highest one.
+    """
+    fetched = 0
+    valid = 0
+    
+    @dlt.transformer(
+        data_from=resource,
+        name=f"{resource.name}_coverage",
+        table_name=TABLE_COVERAGE_MANIFEST,
+        write_disposition="merge",
+        primary_key=["airport", "direction", "flight_date"],
+        columns={
+            "flight_count": {"data_type": "bigint", "dedup_sort": "desc"},
+            "valid_flight_count": {"data_type": "bigint"},
+        },
+    )
+    def coverage(flights):
+        nonlocal fetched, valid
+        fetched += flights.num_rows
+        valid += flights[VALIDATION_ERRORS_COLUMN].null_count
+        yield {
+            "airport": airport,
+            "direction": direction,
+            "flight_date": date,
+            "flight_count": fetched,
+            "valid_flight_count": valid,
+            "fetched_at": datetime.now(timezone.utc),
+        }
+    
+    return coverage
+
+
 @dlt.source(name="swedavia_flights")
 def swedavia_source(
     api_key: TSecretStrValue = dlt.secrets.value,
@@ -15,6 +81,7 @@ def swedavia_source(
     airports: List[str] = dlt.config.value,
     date: str = dlt.config.value,
     api_call_delay: float = dlt.config.value,
+    endpoints: Optional[List[Tuple[str, str]]] = None,
 ):
     """
     DLT source for Swedavia arrivals and departures for multiple airports.
@@ -22,12 +89,17 @@ def swedavia_source(
     Loops through each airport individually using /{airport}/arrivals/{date} and
     /{airport}/departures/{date} endpoints (proven reliable in testing).
     
+    Every endpoint also writes a row to the coverage manifest with the number of
+    flights it returned, so later runs can tell which airport-days are missing.
+    
     Args:
         api_key: Swedavia API subscription key
         base_url: API base URL
         airports: List of airport IATA codes (e.g., ['ARN', 'GOT', 'MMX'])
         date: Date in YYYY-MM-DD format
         api_call_delay: Delay between API calls in seconds (recommend 2.0+)
+        endpoints: Optional (airport, direction) pairs to fetch instead of both
+            directions for every airport, e.g. [('ARN', 'departures')]
     """
     
     headers = {
@@ -35,32 +107,28 @@ def swedavia_source(
         "Accept": "application/json",
     }
     
-    logger.info(f"Fetching flights for {len(airports)} airports on {date}")
-    logger.info(f"Airports: {', '.join(airports)}")
+    # Default: arrivals and departures for every airport
+    if endpoints is None:
+        endpoints = [(airport, direction) for airport in airports for direction in DIRECTIONS]
+        logger.info(f"Fetching flights for {len(airports)} airports on {date}")
+        logger.info(f"Airports: {', '.join(airports)}")
+    else:
+        logger.info(f"Fetching {len(endpoints)} endpoint(s) on {date}")
     
-    # Build resource configurations for all airports
+    # Build resource configurations for all endpoints
     resources_config = []
+    resource_endpoints = {}  # resource name -> (airport, direction)
     
-    for airport in airports:
-        # Arrivals for this airport
-        resources_config.append({
-            "name": f"{airport.lower()}_arrivals",
-            "endpoint": {
-                "path": f"/{airport}/arrivals/{date}",
-                "data_selector": "flights",
-            },
-            "table_name": "flights_arrivals_raw",
-            "write_disposition": "append",
-        })
-        
-        # Departures for this airport
+    for airport, direction in endpoints:
+        name = f"{airport.lower()}_{direction}"
+        resource_endpoints[name] = (airport, direction)
         resources_config.append({
-            "name": f"{airport.lower()}_departures",
+            "name": name,
             "endpoint": {
-                "path": f"/{airport}/departures/{date}",
+                "path": f"/{airport}/{direction}/{date}",
                 "data_selector": "flights",
             },
-            "table_name": "flights_departures_raw",
+            "table_name": TABLE_ARRIVALS_RAW if direction == "arrivals" else TABLE_DEPARTURES_RAW,
             "write_disposition": "append",
         })
     
@@ -83,4 +151,12 @@ def swedavia_source(
         if i > 0:  # No delay before first call
             time.sleep(api_call_delay)
         
+        # Validate each response into typed records and hand dlt an arrow table
+        airport, direction = resource_endpoints[resource.name]
+        table_name = TABLE_ARRIVALS_RAW if direction == "arrivals" else TABLE_DEPARTURES_RAW
+        resource.add_step(flight_record_step(airport, direction, date, raw_column_types(table_name)))
+        
         yield resource
+        
+        # Record what this endpoint returned in the coverage manifest
+        yield coverage_transformer(resource, airport, direction, date)
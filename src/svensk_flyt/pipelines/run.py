@@ -5,6 +5,7 @@ This script:
 1. Loads configuration from environment variables
 2. Sets up DuckDB as the destination
 3. Runs the Swedavia source to fetch flight data for all airports
+   (or, with FILL_GAPS=true, only the airport-days missing from the coverage manifest)
 4. Loads data into DuckDB raw tables
 5. Validates and logs results
 """
@@ -20,13 +21,16 @@ from dotenv import load_dotenv
 from svensk_flyt.constants import (
     SWEDAVIA_AIRPORTS,
     SWEDAVIA_API_BASE_URL,
+    SWEDAVIA_API_HISTORY_DAYS,
+    DIRECTIONS,
     DUCKDB_FILE_PATH,
     DUCKDB_DATASET_NAME,
     API_CALL_DELAY_SECONDS,
     API_RETRY_ATTEMPTS,
     API_RETRY_DELAY_SECONDS,
-    TABLE_ARRIVALS_RAW,
-    TABLE_DEPARTURES_RAW,
+    TABLE_COVERAGE_MANIFEST,
+    VALIDATION_BASELINE_DAYS,
+    VALIDATION_SHORT_RATIO,
 )
 from svensk_flyt.defs.dlt.pipelines.swedavia import swedavia_source
 
@@ -55,6 +59,11 @@ def load_configuration():
     backfill_days = int(os.getenv("BACKFILL_DAYS", "1"))  # Default to 1 day (daily runs); max 3 days (API limit)
     airports = os.getenv("AIRPORTS", ",".join(SWEDAVIA_AIRPORTS)).split(",")
     airports = [a.strip().upper() for a in airports]  # Normalize
+    fill_gaps = os.getenv("FILL_GAPS", "false").strip().lower() in ("1", "true", "yes")
+    
+    # Gap filling checks the whole window the API still serves
+    if fill_gaps:
+        backfill_days = SWEDAVIA_API_HISTORY_DAYS
     
     # Generate date range for backfill (today going back N days)
     dates = []
@@ -67,6 +76,7 @@ def load_configuration():
         "base_url": SWEDAVIA_API_BASE_URL,
         "airports": airports,
         "dates": dates,  # Changed from single 'date' to list of 'dates'
+        "fill_gaps": fill_gaps,
         "duckdb_path": duckdb_path,
         "api_call_delay": API_CALL_DELAY_SECONDS,
         "api_retry_attempts": API_RETRY_ATTEMPTS,
@@ -85,42 +95,237 @@ def setup_destination(duckdb_path: str) -> dict:
     return dlt.destinations.duckdb(duckdb_path)
 
 
-def validate_results(pipeline) -> dict:
-    """Validate that data was successfully loaded."""
-    results = {}
+def summarize_load_packages(load_infos: list) -> dict:
+    """Collect load ids, package states and failed jobs from dlt load info."""
+    summary = {"load_ids": [], "package_states": {}, "failed_jobs": []}
+    
+    for load_info in load_infos:
+        for package in load_info.load_packages:
+            summary["load_ids"].append(package.load_id)
+            summary["package_states"][package.load_id] = package.state
+            for job in package.jobs.get("failed_jobs", []):
+                summary["failed_jobs"].append({
+                    "load_id": package.load_id,
+                    "table": job.job_file_info.table_name,
+                    "message": job.failed_message,
+                })
+    
+    return summary
+
+
+def completed_loads_filter(client) -> str:
+    """
+    SQL condition keeping only manifest rows from loads that fully completed.
+    
+    The manifest row is written in the same load package as the raw rows, so a
+    package whose raw jobs failed can still merge its manifest row; such loads
+    never get a `_dlt_loads` entry with status 0.
+    """
+    loads_table = client.make_qualified_table_name("_dlt_loads")
+    return f"_dlt_load_id IN (SELECT load_id FROM {loads_table} WHERE status = 0)"
+
+
+def load_manifest_counts(client, manifest_table: str, load_ids: list) -> dict:
+    """Flights returned and flights without validation errors per endpoint, written by the given loads."""
+    placeholders = ", ".join(["%s"] * len(load_ids))
+    rows = client.execute_sql(
+        f"""
+        SELECT airport, direction, CAST(flight_date AS VARCHAR), flight_count, valid_flight_count
+        FROM {manifest_table}
+        WHERE _dlt_load_id IN ({placeholders})
+          AND {completed_loads_filter(client)}
+        """,
+        *load_ids,
+    )
+    return {
+        (airport, direction, date): (count, valid)
+        for airport, direction, date, count, valid in rows or []
+    }
+
+
+def load_baselines(client, manifest_table: str) -> dict:
+    """Median flights returned per (airport, direction) over the most recent non-empty days."""
+    rows = client.execute_sql(
+        f"""
+        WITH recent AS (
+            SELECT
+                airport,
+                direction,
+                flight_count,
+                row_number() OVER (
+                    PARTITION BY airport, direction ORDER BY flight_date DESC
+                ) AS day_rank
+            FROM {manifest_table}
+            WHERE flight_count > 0
+              AND {completed_loads_filter(client)}
+        )
+        SELECT airport, direction, median(flight_count)
+        FROM recent
+        WHERE day_rank <= %s
+        GROUP BY airport, direction
+        """,
+        VALIDATION_BASELINE_DAYS,
+    )
+    return {(airport, direction): baseline for airport, direction, baseline in rows or []}
+
+
+def classify_count(count, baseline) -> str:
+    """
+    Status of the flights an endpoint returned, compared with its baseline.
+    
+    "missing" when there is no count at all, "zero" when it returned no flights,
+    "short" when it returned fewer than VALIDATION_SHORT_RATIO of the baseline,
+    and "ok" otherwise (including when there is no baseline yet).
+    """
+    if count is None:
+        return "missing"
+    if count == 0:
+        return "zero"
+    if baseline and count < baseline * VALIDATION_SHORT_RATIO:
+        return "short"
+    return "ok"
+
+
+def classify_endpoints(counts: dict, baselines: dict, expected: list) -> list:
+    """
+    Compare flights returned per endpoint against each airport's rolling baseline.
+    
+    `expected` lists the (airport, direction, date) endpoints this run fetched,
+    so one without a count returned nothing and is "zero".
+    """
+    endpoints = []
+    
+    for airport, direction, date in expected:
+        baseline = baselines.get((airport, direction))
+        rows = counts.get((airport, direction, date), 0)
+        endpoints.append({
+            "airport": airport,
+            "direction": direction,
+            "date": date,
+            "rows": rows,
+            "baseline": baseline,
+            "status": classify_count(rows, baseline),
+        })
+    
+    return endpoints
+
+
+def validate_results(pipeline, load_infos: list, expected: list) -> dict:
+    """
+    Validate what this run loaded, scoped to its dlt load ids.
+    
+    Per-endpoint counts come from the coverage manifest rows written by this
+    run's loads, so the cost does not grow with the raw tables' history. Each
+    airport/direction/date is checked against the same rolling baseline that
+    fill-gaps mode uses.
+    """
+    results = summarize_load_packages(load_infos)
+    endpoints = []
+    invalid = []
     
     try:
-        with pipeline.sql_client() as client:
-            # Check arrivals table
-            arrivals_result = client.execute_sql(
-                f"SELECT COUNT(*) as count FROM {TABLE_ARRIVALS_RAW}"
-            )
-            results["arrivals_rows"] = arrivals_result[0][0] if arrivals_result else 0
-            
-            # Check departures table
-            departures_result = client.execute_sql(
-                f"SELECT COUNT(*) as count FROM {TABLE_DEPARTURES_RAW}"
-            )
-            results["departures_rows"] = departures_result[0][0] if departures_result else 0
-            
-            # Check unique airports in data
-            try:
-                arrivals_airports = client.execute_sql(
-                    f"SELECT DISTINCT airport FROM {TABLE_ARRIVALS_RAW} ORDER BY airport"
-                )
-                results["arrivals_airports"] = [row[0] for row in arrivals_airports] if arrivals_airports else []
-            except Exception as e:
-                logger.warning(f"Could not fetch arrivals airports: {e}")
-                results["arrivals_airports"] = []
+        if results["load_ids"]:
+            with pipeline.sql_client() as client:
+                manifest_table = client.make_qualified_table_name(TABLE_COVERAGE_MANIFEST)
+                manifest = load_manifest_counts(client, manifest_table, results["load_ids"])
+                baselines = load_baselines(client, manifest_table)
+            counts = {key: count for key, (count, _) in manifest.items()}
+            endpoints = classify_endpoints(counts, baselines, expected)
+            invalid = [
+                {"airport": airport, "direction": direction, "date": date,
+                 "rows": count, "invalid_rows": count - valid}
+                for (airport, direction, date), (count, valid) in sorted(manifest.items())
+                if valid is not None and valid < count
+            ]
+        else:
+            endpoints = classify_endpoints({}, {}, expected)
             
     except Exception as e:
         logger.error(f"Validation error: {e}")
-        results["arrivals_rows"] = 0
-        results["departures_rows"] = 0
+    
+    results["endpoints"] = endpoints
+    results["arrivals_rows"] = sum(e["rows"] for e in endpoints if e["direction"] == "arrivals")
+    results["departures_rows"] = sum(e["rows"] for e in endpoints if e["direction"] == "departures")
+    results["arrivals_airports"] = sorted({
+        e["airport"] for e in endpoints if e["direction"] == "arrivals" and e["rows"] > 0
+    })
+    results["zero_row_endpoints"] = [e for e in endpoints if e["status"] == "zero"]
+    results["short_endpoints"] = [e for e in endpoints if e["status"] == "short"]
+    results["invalid_endpoints"] = invalid
     
     return results
 
 
+def load_coverage(client, manifest_table: str, since: str) -> dict:
+    """
+    Flights returned per (airport, direction, date) for manifest entries from `since` onwards.
+    
+    Entries from incomplete loads are left out, so their airport-days count as missing.
+    """
+    rows = client.execute_sql(
+        f"""
+        SELECT airport, direction, CAST(flight_date AS VARCHAR), flight_count
+        FROM {manifest_table}
+        WHERE flight_date >= %s
+          AND {completed_loads_filter(client)}
+        """,
+        since,
+    )
+    return {(airport, direction, date): count for airport, direction, date, count in rows or []}
+
+
+def find_coverage_gaps(coverage: dict, baselines: dict, airports: list, dates: list) -> list:
+    """
+    List airport-days that are missing from the manifest or look incomplete.
+    
+    Reasons are the statuses of `classify_count`: "missing" when the endpoint
+    was never fetched successfully, "zero" or "short" when it returned no or
+    too few flights. Counts are what the API returned, so flights with invalid
+    fields do not make an endpoint look short.
+    """
+    gaps = []
+    
+    for date in dates:
+        for airport in airports:
+            for direction in DIRECTIONS:
+                count = coverage.get((airport, direction, date))
+                baseline = baselines.get((airport, direction))
+                reason = classify_count(count, baseline)
+                if reason == "ok":
+                    continue
+                gaps.append({
+                    "airport": airport,
+                    "direction": direction,
+                    "date": date,
+                    "flight_count": count,
+                    "baseline": baseline,
+                    "reason": reason,
+                })
+    
+    return gaps
+
+
+def plan_gap_fill(pipeline, airports: list, dates: list) -> dict:
+    """Map each date to the (airport, direction) endpoints that need refetching."""
+    coverage, baselines = {}, {}
+    
+    try:
+        with pipeline.sql_client() as client:
+            manifest_table = client.make_qualified_table_name(TABLE_COVERAGE_MANIFEST)
+            coverage = load_coverage(client, manifest_table, min(dates))
+            baselines = load_baselines(client, manifest_table)
+    except Exception as e:
+        # No manifest yet (first run) means every endpoint is a gap
+        logger.warning(f"Could not read coverage manifest, fetching everything: {e}")
+    
+    plan = {}
+    for gap in find_coverage_gaps(coverage, baselines, airports, dates):
+        logger.info(f"  - Gap ({gap['reason']}): {gap['airport']} {gap['direction']} {gap['date']}")
+        plan.setdefault(gap["date"], []).append((gap["airport"], gap["direction"]))
+    
+    return plan
+
+
 def main():
     """Run the full ingestion pipeline."""
     logger.info("=" * 80)
@@ -147,11 +352,23 @@ def main():
         )
         logger.info(f"Pipeline created: {pipeline.pipeline_name}")
         
+        # Decide which endpoints to fetch per date (None = all airports, both directions)
+        if config["fill_gaps"]:
+            logger.info("Checking coverage manifest for gaps...")
+            fetch_plan = plan_gap_fill(pipeline, config["airports"], config["dates"])
+            logger.info(
+                f"Fill gaps: {sum(len(e) for e in fetch_plan.values())} endpoint(s) "
+                f"over {len(fetch_plan)} date(s) to fetch"
+            )
+        else:
+            fetch_plan = {date: None for date in config["dates"]}
+        
         # Loop through each date and load data
-        total_arrivals = 0
-        total_departures = 0
+        load_infos = []
+        expected = []
+        failed_dates = []
         
-        for date in config["dates"]:
+        for date, endpoints in fetch_plan.items():
             logger.info(f"Fetching flight data for {date}...")
             source = swedavia_source(
                 api_key=config["api_key"],
@@ -159,24 +376,56 @@ def main():
                 airports=config["airports"],
                 date=date,
                 api_call_delay=config["api_call_delay"],
+                endpoints=endpoints,
             )
             
-            load_info = pipeline.run(source)
+            # Keep going on failure; the missing airport-days show up as gaps next run
+            try:
+                load_info = pipeline.run(source)
+            except Exception as e:
+                logger.error(f"Data load failed for {date}: {e}")
+                failed_dates.append(date)
+                continue
+            
+            load_infos.append(load_info)
+            if endpoints is None:
+                endpoints = [(a, d) for a in config["airports"] for d in DIRECTIONS]
+            expected.extend((airport, direction, date) for airport, direction in endpoints)
             logger.info(f"Data load completed for {date}")
         
         # Validate results after all dates loaded
         logger.info("Validating results...")
-        validation = validate_results(pipeline)
+        validation = validate_results(pipeline, load_infos, expected)
         
         logger.info("=" * 80)
-        logger.info("Pipeline completed successfully!")
-        logger.info(f"  - Arrivals rows: {validation.get('arrivals_rows', 0)}")
-        logger.info(f"  - Departures rows: {validation.get('departures_rows', 0)}")
+        if failed_dates:
+            logger.error(f"Pipeline completed with failures for: {', '.join(failed_dates)}")
+        else:
+            logger.info("Pipeline completed successfully!")
+        logger.info(f"  - Load packages: {', '.join(validation['load_ids']) or 'none'}")
+        logger.info(f"  - Arrivals rows loaded: {validation.get('arrivals_rows', 0)}")
+        logger.info(f"  - Departures rows loaded: {validation.get('departures_rows', 0)}")
         if validation.get('arrivals_airports'):
             logger.info(f"  - Airports with data: {', '.join(validation['arrivals_airports'])}")
+        for job in validation["failed_jobs"]:
+            logger.warning(f"  - Failed job in {job['load_id']} ({job['table']}): {job['message']}")
+        for endpoint in validation["zero_row_endpoints"]:
+            logger.warning(
+                f"  - No rows: {endpoint['airport']} {endpoint['direction']} {endpoint['date']}"
+            )
+        for endpoint in validation["short_endpoints"]:
+            logger.warning(
+                f"  - Short: {endpoint['airport']} {endpoint['direction']} {endpoint['date']} "
+                f"({endpoint['rows']} rows, baseline {endpoint['baseline']:.0f})"
+            )
+        for endpoint in validation["invalid_endpoints"]:
+            logger.warning(
+                f"  - Invalid fields: {endpoint['airport']} {endpoint['direction']} {endpoint['date']} "
+                f"({endpoint['invalid_rows']} of {endpoint['rows']} flights, see validation_errors)"
+            )
         logger.info("=" * 80)
         
-        return 0
+        return 1 if failed_dates else 0
         
     except Exception as e:
         logger.error(f"Pipeline failed with error: {e}", exc_info=True)
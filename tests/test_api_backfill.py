@@ -55,16 +55,17 @@ def test_backfill_single_airport():
             # Extract arrivals
             arrivals_resource = source.resources.get("arn_arrivals")
             if arrivals_resource:
-                arrivals = list(arrivals_resource)
-                total_arrivals += len(arrivals)
-                print(f"  ✓ Arrivals: {len(arrivals)}")
+                # Count while streaming; each item is one validated page as an arrow table
+                arrivals = sum(table.num_rows for table in arrivals_resource)
+                total_arrivals += arrivals
+                print(f"  ✓ Arrivals: {arrivals}")
             
             # Extract departures
             departures_resource = source.resources.get("arn_departures")
             if departures_resource:
-                departures = list(departures_resource)
-                total_departures += len(departures)
-                print(f"  ✓ Departures: {len(departures)}")
+                departures = sum(table.num_rows for table in departures_resource)
+                total_departures += departures
+                print(f"  ✓ Departures: {departures}")
             
             successful_days += 1
                 
@@ -0,0 +1,124 @@
+"""Test batch validation of Swedavia flights into typed FlightRecords."""
+
+import json
+from datetime import datetime, timezone
+
+import pyarrow as pa
+
+from svensk_flyt.benchmarks.flight_records import make_api_flights, retained_bytes, step_memory
+from svensk_flyt.defs.dlt.pipelines.flight_records import flight_record_step, validate_flights
+
+
+def test_validate_flights_nulls_invalid_fields():
+    """Timestamps are parsed, and bad values are nulled with errors kept, not dropped."""
+    flights = [
+        {
+            "flightId": "SK132",
+            "airlineOperator": {"iata": "SK", "icao": "SAS", "name": "SAS Scandinavian Airlines"},
+            "arrivalTime": {"scheduledUtc": "2026-01-25T07:55:00Z", "actualUtc": "2026-01-25T07:40:24Z"},
+            "locationAndStatus": {"flightLegStatus": "LAN", "terminal": 5},
+            "remarksEnglish": [{"comment": "Baggage at belt 3"}],
+        },
+        {"flightId": "SK701", "locationAndStatus": {"flightLegStatus": "XYZ", "gate": "F12"}},
+        {"flightId": "FR7619", "arrivalTime": {"scheduledUtc": "not a time"}},
+    ]
+
+    batch = validate_flights(flights, airport="ARN", direction="arrivals", date="2026-01-25")
+
+    assert len(batch) == 3
+    assert batch.invalid == 2
+    assert batch.errors[1] == [{
+        "field": "locationAndStatus.flightLegStatus",
+        "message": batch.errors[1][0]["message"],
+        "input": "XYZ",
+    }]
+    assert batch.errors[2][0]["field"] == "arrivalTime.scheduledUtc"
+
+    first, second, third = batch.records
+    assert first.arrival_scheduled_utc == datetime(2026, 1, 25, 7, 55, tzinfo=timezone.utc)
+    # Codes are kept as returned until to_arrow matches them to the raw column type
+    assert first.terminal == 5
+    assert second.flight_leg_status is None
+    assert second.gate == "F12"
+    assert third.flight_id == "FR7619"
+    assert third.arrival_scheduled_utc is None
+
+
+def test_to_arrow_uses_raw_columns():
+    """The table handed to dlt has the direction's raw columns, plus unknown keys and errors."""
+    flights = make_api_flights(50, direction="departures")
+    flights[0]["newField"] = "kept"
+    flights[0]["locationAndStatus"]["standNumber"] = 17
+    flights[1]["departureTime"]["actualUtc"] = "yesterday"
+
+    table = validate_flights(flights, direction="departures").to_arrow()
+
+    assert table.num_rows == 50
+    assert table.schema.field("departure_time__scheduled_utc").type == pa.timestamp("us", tz="UTC")
+    assert table.schema.field("flight_leg_identifier__flight_departure_date_utc").type == pa.timestamp("us", tz="UTC")
+    assert table.schema.field("check_in__check_in_desk_from").type == pa.int64()
+    assert table.schema.field("location_and_status__terminal").type == pa.int64()
+    assert table["airline_operator__iata"].to_pylist() == [f["airlineOperator"]["iata"] for f in flights]
+    assert table["flight_leg_identifier__flight_id"][0].as_py() == flights[0]["flightId"]
+    assert json.loads(table["remarks_english"][0].as_py()) == []
+
+    # Arrival-only columns stay out of the departures table
+    assert "arrival_time__scheduled_utc" not in table.column_names
+    assert "baggage__baggage_claim_unit" not in table.column_names
+
+    # Unknown keys are kept as JSON instead of becoming columns
+    assert json.loads(table["extra_fields"][0].as_py()) == {
+        "newField": "kept",
+        "locationAndStatus": {"standNumber": 17},
+    }
+    assert table["extra_fields"].null_count == 49
+
+    # The bad value is kept with its error, only the typed column is null
+    assert table["departure_time__actual_utc"][1].as_py() is None
+    errors = json.loads(table["validation_errors"][1].as_py())
+    assert errors[0]["field"] == "departureTime.actualUtc"
+    assert errors[0]["input"] == "yesterday"
+    assert table["validation_errors"].null_count == 49
+
+
+def test_to_arrow_keeps_raw_column_types():
+    """Every page of a table gets the same schema, and codes follow the raw table's column type."""
+    flights = make_api_flights(10)
+    flights[0]["locationAndStatus"]["terminal"] = "5A"
+    flights[0]["newKey"] = 1
+    flights[1]["newKey"] = "one"
+
+    empty = validate_flights([], direction="arrivals").to_arrow()
+    table = validate_flights(flights, direction="arrivals").to_arrow()
+    assert table.schema == empty.schema
+
+    # A bigint terminal column nulls codes that are not integers and records why
+    terminal = table["location_and_status__terminal"]
+    assert terminal[0].as_py() is None
+    assert terminal[1].as_py() == int(flights[1]["locationAndStatus"]["terminal"])
+    errors = json.loads(table["validation_errors"][0].as_py())
+    assert errors == [{
+        "field": "locationAndStatus.terminal",
+        "message": "Input should be an integer, location_and_status__terminal is a bigint column",
+        "input": "5A",
+    }]
+
+    # A text terminal column keeps every code
+    batch = validate_flights(flights, direction="arrivals")
+    table = batch.to_arrow({"location_and_status__terminal": "text"})
+    assert table.schema.field("location_and_status__terminal").type == pa.string()
+    assert table["location_and_status__terminal"][0].as_py() == "5A"
+    assert batch.invalid == 0
+
+
+def test_step_hands_dlt_less_than_the_page():
+    """The step's output, and its peak while running, are smaller than the page it replaces."""
+    payload = json.dumps({"flights": make_api_flights(1000)})
+    step = flight_record_step("ARN", "arrivals", "2026-01-25")
+
+    page_bytes = retained_bytes(lambda: json.loads(payload)["flights"])
+    memory = step_memory(json.loads(payload)["flights"], step)
+
+    assert step(json.loads(payload)["flights"]).num_rows == 1000
+    assert memory["output_bytes"] < page_bytes / 4
+    assert memory["peak_bytes"] < page_bytes
@@ -0,0 +1,124 @@
+"""Test the synthetic flight-data generator and benchmark baseline comparison."""
+
+from datetime import date
+
+import duckdb
+
+from svensk_flyt.benchmarks.synthetic import FLIGHTS_PER_DAY, generate_synthetic_flights
+from svensk_flyt.benchmarks.dbt_benchmark import compare_to_baseline, profile_models
+from svensk_flyt.constants import TABLE_ARRIVALS_RAW, TABLE_DEPARTURES_RAW
+
+
+def test_generate_synthetic_flights(tmp_path):
+    """Generated tables have the expected scale, duplicates and status mix."""
+    db_path = str(tmp_path / "synthetic.duckdb")
+
+    results = generate_synthetic_flights(
+        duckdb_path=db_path,
+        days=3,
+        airports=["ARN", "KRN"],
+        duplicates_per_flight=2,
+        status_mix={"LAN": 1.0},
+        end_date=date(2026, 1, 25),
+    )
+
+    expected_rows = 3 * (FLIGHTS_PER_DAY["ARN"] + FLIGHTS_PER_DAY["KRN"]) * 2
+    assert results["arrivals_rows"] == expected_rows
+    assert results["departures_rows"] == expected_rows
+    assert results["start_date"] == "2026-01-23"
+
+    con = duckdb.connect(db_path, read_only=True)
+    try:
+        # Every flight appears once per load
+        loads_per_flight = con.execute(f"""
+            SELECT DISTINCT COUNT(*)
+            FROM flights.{TABLE_ARRIVALS_RAW}
+            GROUP BY flight_leg_identifier__arrival_airport_iata, flight_id, arrival_time__scheduled_utc
+            HAVING COUNT(*) > 2
+        """).fetchall()
+        assert loads_per_flight == []
+
+        statuses = con.execute(f"""
+            SELECT DISTINCT location_and_status__flight_leg_status FROM flights.{TABLE_DEPARTURES_RAW}
+        """).fetchall()
+        assert statuses == [("LAN",)]
+
+        # Columns have the types dlt gives them when loading the API responses
+        types = dict(con.execute(f"""
+            SELECT column_name, data_type FROM information_schema.columns
+            WHERE table_name = '{TABLE_ARRIVALS_RAW}'
+              AND column_name IN ('location_and_status__terminal', 'flight_leg_identifier__flight_departure_date_utc')
+        """).fetchall())
+        assert types == {
+            "location_and_status__terminal": "BIGINT",
+            "flight_leg_identifier__flight_departure_date_utc": "TIMESTAMP WITH TIME ZONE",
+        }
+
+        # Same seed and parameters generate the same rows
+        first_ids = con.execute(f"SELECT _dlt_id FROM flights.{TABLE_ARRIVALS_RAW} ORDER BY _dlt_id LIMIT 5").fetchall()
+        loads = con.execute("SELECT COUNT(*) FROM flights._dlt_loads").fetchone()[0]
+        assert loads == 4  # 3 days, each flight re-fetched by the next day's load
+    finally:
+        con.close()
+
+    generate_synthetic_flights(
+        duckdb_path=db_path,
+        days=3,
+        airports=["ARN", "KRN"],
+        duplicates_per_flight=2,
+        status_mix={"LAN": 1.0},
+        end_date=date(2026, 1, 25),
+    )
+    con = duckdb.connect(db_path, read_only=True)
+    try:
+        assert con.execute(
+            f"SELECT _dlt_id FROM flights.{TABLE_ARRIVALS_RAW} ORDER BY _dlt_id LIMIT 5"
+        ).fetchall() == first_ids
+    finally:
+        con.close()
+
+
+def test_compare_to_baseline():
+    """Only meaningful slowdowns and memory growth are flagged as regressions."""
+    baseline = {
+        "dbt_build": {"seconds": 10.0, "peak_rss_mb": 500.0},
+        "models": {
+            "fct_flights": {"status": "success", "execution_time": 4.0, "peak_buffer_memory_bytes": 100_000_000},
+            "dim_date": {"status": "success", "execution_time": 0.1, "peak_buffer_memory_bytes": 1_000_000},
+        },
+    }
+    results = {
+        "dbt_build": {"seconds": 10.5, "peak_rss_mb": 510.0},
+        "models": {
+            "fct_flights": {"status": "success", "execution_time": 8.0, "peak_buffer_memory_bytes": 300_000_000},
+            # Doubles, but well under the absolute noise threshold
+            "dim_date": {"status": "success", "execution_time": 0.2, "peak_buffer_memory_bytes": 2_000_000},
+        },
+    }
+
+    regressions = compare_to_baseline(results, baseline)
+
+    assert regressions == [
+        "fct_flights execution_time: 4.0 -> 8.0",
+        "fct_flights peak_buffer_memory_bytes: 100000000 -> 300000000",
+    ]
+
+
+def test_profile_models_reports_memory_per_model(tmp_path):
+    """A cheap model profiled after a hungry one does not inherit its peak memory."""
+    db_path = str(tmp_path / "profile.duckdb")
+    con = duckdb.connect(db_path)
+    con.execute("CREATE TABLE numbers AS SELECT range AS n, range % 1000 AS k FROM range(2000000)")
+    con.close()
+
+    def model(name, sql):
+        return {"unique_id": f"model.svensk_flyt.{name}", "status": "success",
+                "execution_time": 0.1, "compiled_code": sql}
+
+    models = profile_models(db_path, [
+        model("hungry", "SELECT a.k, count(*) FROM numbers a JOIN numbers b USING (n) GROUP BY a.k"),
+        model("cheap", "SELECT 1"),
+    ])
+
+    assert models["hungry"]["peak_buffer_memory_bytes"] > 0
+    assert models["cheap"]["peak_buffer_memory_bytes"] < models["hungry"]["peak_buffer_memory_bytes"]
@@ -0,0 +1,223 @@
+"""Test load-id scoped validation and coverage gap helpers in pipelines/run.py."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+
+import dlt
+import pytest
+from dlt.pipeline.exceptions import PipelineStepFailed
+
+from svensk_flyt.benchmarks.flight_records import make_api_flights
+from svensk_flyt.constants import TABLE_ARRIVALS_RAW, TABLE_COVERAGE_MANIFEST
+from svensk_flyt.defs.dlt.pipelines.swedavia import swedavia_source
+from svensk_flyt.pipelines.run import (
+    classify_count,
+    classify_endpoints,
+    find_coverage_gaps,
+    load_baselines,
+    load_coverage,
+    load_manifest_counts,
+    plan_gap_fill,
+    summarize_load_packages,
+    validate_results,
+)
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_classify_count():
+    """Validation and gap detection share one rule for comparing counts with baselines."""
+    assert classify_count(None, 265.0) == "missing"
+    assert classify_count(0, None) == "zero"
+    assert classify_count(120, 265.0) == "short"
+    assert classify_count(133, 265.0) == "ok"
+    assert classify_count(5, None) == "ok"
+
+
+def test_classify_endpoints():
+    """Missing endpoints are zero, endpoints well below baseline are short."""
+    counts = {
+        ("ARN", "arrivals", "2026-01-25"): 270,
+        ("ARN", "departures", "2026-01-25"): 90,
+        ("KRN", "arrivals", "2026-01-25"): 5,
+    }
+    baselines = {
+        ("ARN", "arrivals"): 265.0,
+        ("ARN", "departures"): 268.0,
+    }
+
+    expected = [
+        (airport, direction, "2026-01-25")
+        for airport in ["ARN", "KRN"]
+        for direction in ["arrivals", "departures"]
+    ]
+
+    endpoints = classify_endpoints(counts, baselines, expected)
+    statuses = {(e["airport"], e["direction"]): e["status"] for e in endpoints}
+
+    assert statuses == {
+        ("ARN", "arrivals"): "ok",
+        ("ARN", "departures"): "short",
+        # No baseline yet, so any rows are accepted
+        ("KRN", "arrivals"): "ok",
+        ("KRN", "departures"): "zero",
+    }
+
+
+def test_summarize_load_packages():
+    """Load ids and failed jobs are taken from dlt load package metadata."""
+    failed_job = SimpleNamespace(
+        job_file_info=SimpleNamespace(table_name="flights_arrivals_raw"),
+        failed_message="Conversion Error",
+    )
+    load_infos = [
+        SimpleNamespace(load_packages=[
+            SimpleNamespace(load_id="1769350000.1", state="loaded", jobs={"failed_jobs": []}),
+        ]),
+        SimpleNamespace(load_packages=[
+            SimpleNamespace(load_id="1769350060.2", state="loaded", jobs={"failed_jobs": [failed_job]}),
+        ]),
+    ]
+
+    summary = summarize_load_packages(load_infos)
+
+    assert summary["load_ids"] == ["1769350000.1", "1769350060.2"]
+    assert summary["failed_jobs"] == [{
+        "load_id": "1769350060.2",
+        "table": "flights_arrivals_raw",
+        "message": "Conversion Error",
+    }]
+
+
+def test_find_coverage_gaps():
+    """Only missing, empty or short airport-days are scheduled for refetching."""
+    coverage = {
+        ("ARN", "arrivals", "2026-01-24"): 268,
+        ("ARN", "departures", "2026-01-24"): 0,
+        ("ARN", "arrivals", "2026-01-25"): 120,
+    }
+    baselines = {
+        ("ARN", "arrivals"): 265.0,
+        ("ARN", "departures"): 266.0,
+    }
+
+    gaps = find_coverage_gaps(coverage, baselines, ["ARN"], ["2026-01-24", "2026-01-25"])
+
+    assert [(g["direction"], g["date"], g["reason"]) for g in gaps] == [
+        ("departures", "2026-01-24", "zero"),
+        ("arrivals", "2026-01-25", "short"),
+        ("departures", "2026-01-25", "missing"),
+    ]
+
+
+@pytest.fixture
+def mock_api():
+    """Serve canned Swedavia responses, keyed by path, from a local HTTP server."""
+    pages = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = json.dumps(pages[self.path]).encode() if self.path in pages else None
+            self.send_response(200 if body else 404)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            if body:
+                self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", pages
+    server.shutdown()
+
+
+def test_manifest_and_gap_fill_against_duckdb(mock_api, tmp_path, monkeypatch):
+    """The source writes a manifest row per endpoint, and a failed load leaves its endpoint a gap."""
+    # .dlt/config.toml at the repo root adds the dlt load ids to the raw tables
+    monkeypatch.chdir(REPO_ROOT)
+    base_url, pages = mock_api
+    date = "2026-01-25"
+    airports = ["ARN", "GOT"]
+
+    arn_arrivals = make_api_flights(20)
+    arn_arrivals[0]["newKey"] = 1
+    arn_arrivals[1]["arrivalTime"]["actualUtc"] = "yesterday"
+    pages.update({
+        f"/ARN/arrivals/{date}": {"flights": arn_arrivals},
+        f"/ARN/departures/{date}": {"flights": []},
+        f"/GOT/arrivals/{date}": {"flights": make_api_flights(5, airport="GOT")},
+        f"/GOT/departures/{date}": {"flights": make_api_flights(7, airport="GOT", direction="departures")},
+    })
+
+    pipeline = dlt.pipeline(
+        pipeline_name="test_coverage_manifest",
+        destination=dlt.destinations.duckdb(str(tmp_path / "svensk_flyt.duckdb")),
+        dataset_name="flights",
+        pipelines_dir=str(tmp_path / "pipelines"),
+    )
+
+    def source(endpoints):
+        return swedavia_source(
+            api_key="test",
+            base_url=base_url,
+            airports=airports,
+            date=date,
+            api_call_delay=0,
+            endpoints=endpoints,
+        )
+
+    # First run skips GOT arrivals; ARN departures returns no flights
+    endpoints = [("ARN", "arrivals"), ("ARN", "departures"), ("GOT", "departures")]
+    load_info = pipeline.run(source(endpoints))
+    expected = [(airport, direction, date) for airport, direction in endpoints]
+
+    with pipeline.sql_client() as client:
+        manifest_table = client.make_qualified_table_name(TABLE_COVERAGE_MANIFEST)
+        assert load_manifest_counts(client, manifest_table, load_info.loads_ids) == {
+            ("ARN", "arrivals", date): (20, 19),
+            ("ARN", "departures", date): (0, 0),
+            ("GOT", "departures", date): (7, 7),
+        }
+        assert load_baselines(client, manifest_table) == {
+            ("ARN", "arrivals"): 20,
+            ("GOT", "departures"): 7,
+        }
+
+    validation = validate_results(pipeline, [load_info], expected)
+    assert validation["arrivals_rows"] == 20
+    assert [(e["airport"], e["direction"]) for e in validation["zero_row_endpoints"]] == [("ARN", "departures")]
+    assert validation["invalid_endpoints"] == [
+        {"airport": "ARN", "direction": "arrivals", "date": date, "rows": 20, "invalid_rows": 1},
+    ]
+    assert plan_gap_fill(pipeline, airports, [date]) == {date: [("ARN", "departures"), ("GOT", "arrivals")]}
+
+    # Inserting into a view fails, so the raw job of the next load fails
+    with pipeline.sql_client() as client:
+        raw_table = client.make_qualified_table_name(TABLE_ARRIVALS_RAW)
+        client.execute_sql(f"ALTER TABLE {raw_table} RENAME TO arrivals_kept")
+        client.execute_sql(f"CREATE VIEW {raw_table} AS SELECT * FROM {client.make_qualified_table_name('arrivals_kept')}")
+
+    with pytest.raises(PipelineStepFailed) as failure:
+        pipeline.run(source([("GOT", "arrivals")]))
+    failed_load_id = failure.value.load_id
+
+    # A partially failed package can still merge its manifest row
+    with pipeline.sql_client() as client:
+        manifest_table = client.make_qualified_table_name(TABLE_COVERAGE_MANIFEST)
+        client.execute_sql(
+            f"""
+            INSERT INTO {manifest_table} (airport, direction, flight_date, flight_count, valid_flight_count, _dlt_load_id, _dlt_id)
+            VALUES ('GOT', 'arrivals', %s, 5, 5, %s, 'partial')
+            """,
+            date,
+            failed_load_id,
+        )
+        assert load_manifest_counts(client, manifest_table, [failed_load_id]) == {}
+        assert ("GOT", "arrivals", date) not in load_coverage(client, manifest_table, date)
+
+    assert plan_gap_fill(pipeline, airports, [date]) == {date: [("ARN", "departures"), ("GOT", "arrivals")]}